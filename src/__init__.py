@@ -47,6 +47,7 @@ DEFAULT_CONFIG = {
     "output_format": "markdown",
     "verbose": False,
     "cache_enabled": True,
+    "parse_cache": False,
     "timeout": 90,
 }
 
@@ -32,6 +32,7 @@ except ImportError:
     anthropic = None
 
 from config import Config
+from parser.parse_cache import enable_parse_cache
 from parser.project_parser import parse_project
 from utils.token_counter import estimate_tokens
 from utils.file_utils import create_directory
@@ -71,6 +72,7 @@ Performance Target:
     parser.add_argument('--max-tokens', type=int, default=1000000, help='Maximum token budget')
     parser.add_argument('--include-tests', action='store_true', help='Include test files in analysis')
     parser.add_argument('--include-private', action='store_true', help='Include private methods and classes')
+    parser.add_argument('--cache', action='store_true', help='Cache parse results on disk between runs, in $XDG_CACHE_HOME/sysc4918 (default ~/.cache/sysc4918)')
     return parser
 
 def validate_arguments(args: argparse.Namespace) -> None:
@@ -120,7 +122,7 @@ def load_configuration(args: argparse.Namespace) -> Config:
     config.max_tokens = args.max_tokens
     config.include_tests = args.include_tests
     config.include_private = args.include_private
-    config.cache_enabled = True  # Default to enabled
+    config.parse_cache = getattr(args, 'cache', False)
     if args.api_key:
         config.api_key = args.api_key
     return config
@@ -220,6 +222,8 @@ async def parse_and_generate_command(args: argparse.Namespace, config: Config) -
         logger.info(f"Parsing project: {project_path}")
         parsing_start = time.time()
         
+        if config.parse_cache:
+            enable_parse_cache()
         result = parse_project(
             str(project_path),
             include_tests=config.include_tests,
@@ -29,6 +29,7 @@ class Config:
         self.debug: bool = False
         self.timeout: int = 90
         self.cache_enabled: bool = True
+        self.parse_cache: bool = False  # On-disk cache of per-file parse results
         self.parse_only: bool = False
         
         # Try to get API key from environment
@@ -1,19 +1,55 @@
 import ast
-from pathlib import Path
-from typing import Optional, Dict, Any, List
+import copy
+import inspect
+import logging
+import os
+from functools import lru_cache
+from typing import Optional, Dict, Any
 
-def parse_code_file(file_path: str, extract_full_code: bool = False) -> Optional[Dict[str, Any]]:
+from .project_files import load_source_tree
+
+logger = logging.getLogger(__name__)
+
+def parse_code_file(
+    file_path: str,
+    extract_full_code: bool = False,
+    include_private: bool = True
+) -> Optional[Dict[str, Any]]:
     """
     Parse a Python file and extract detailed information including full code for entry points.
     
+    Results are cached in memory (a bounded LRU keyed on the file's path, mtime and
+    size) and reused until the file changes; each call returns its own copy.
+    
     Args:
         file_path: Path to the Python file
         extract_full_code: Whether to include full source code (for entry points)
+        include_private: Whether to include _private classes, functions and methods
     """
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            source = f.read()
-        tree = ast.parse(source)
+        st = os.stat(file_path)
+    except OSError as e:
+        logger.error(f"Failed to parse {file_path}: {e}")
+        return None
+
+    module_info = _parse_code_file_cached(
+        file_path, st.st_mtime_ns, st.st_size, extract_full_code, include_private
+    )
+    # The cached result is shared, so callers get a copy they are free to modify
+    return copy.deepcopy(module_info)
+
+@lru_cache(maxsize=256)
+def _parse_code_file_cached(
+    file_path: str, mtime_ns: int, size: int, extract_full_code: bool, include_private: bool
+) -> Optional[Dict[str, Any]]:
+    return _parse_code_file(file_path, extract_full_code, include_private)
+
+def _parse_code_file(
+    file_path: str, extract_full_code: bool, include_private: bool
+) -> Optional[Dict[str, Any]]:
+    """Read and parse a Python file without consulting the cache."""
+    try:
+        source, tree = load_source_tree(file_path)
     except UnicodeDecodeError as e:
         logger.warning(f"Encoding error reading {file_path}: {e}")
         return None
@@ -24,11 +60,11 @@ def parse_code_file(file_path: str, extract_full_code: bool = False) -> Optional
         logger.error(f"Failed to parse {file_path}: {e}")
         return None
 
-    module_name = Path(file_path).stem
+    module_name = os.path.splitext(os.path.basename(file_path))[0]
     module_info = {
         "name": module_name,
         "file": file_path,
-        "docstring": ast.get_docstring(tree),
+        "docstring": _get_docstring(tree),
         "classes": [],
         "functions": [],
         "imports": [],
@@ -41,10 +77,16 @@ def parse_code_file(file_path: str, extract_full_code: bool = False) -> Optional
 
     # Parse module-level nodes
     for node in tree.body:
+        # Skip private definitions before doing any extraction work for them
+        if (not include_private
+                and isinstance(node, (ast.ClassDef, ast.FunctionDef))
+                and _is_private(node.name)):
+            continue
+
         if isinstance(node, ast.ClassDef):
             class_info = {
                 "name": node.name,
-                "docstring": ast.get_docstring(node),
+                "docstring": _get_docstring(node),
                 "methods": [],
                 "bases": [_get_name_from_node(base) for base in node.bases],
                 "decorators": [_get_name_from_node(dec) for dec in node.decorator_list]
@@ -53,24 +95,14 @@ def parse_code_file(file_path: str, extract_full_code: bool = False) -> Optional
             # Parse class methods
             for item in node.body:
                 if isinstance(item, ast.FunctionDef):
-                    method_info = {
-                        "name": item.name,
-                        "docstring": ast.get_docstring(item),
-                        "decorators": [_get_name_from_node(dec) for dec in item.decorator_list],
-                        "args": [arg.arg for arg in item.args.args]
-                    }
-                    class_info["methods"].append(method_info)
+                    if not include_private and _is_private(item.name):
+                        continue
+                    class_info["methods"].append(_extract_function_info(item))
             
             module_info["classes"].append(class_info)
             
         elif isinstance(node, ast.FunctionDef):
-            function_info = {
-                "name": node.name,
-                "docstring": ast.get_docstring(node),
-                "decorators": [_get_name_from_node(dec) for dec in node.decorator_list],
-                "args": [arg.arg for arg in node.args.args]
-            }
-            module_info["functions"].append(function_info)
+            module_info["functions"].append(_extract_function_info(node))
             
         elif isinstance(node, ast.Import):
             for alias in node.names:
@@ -84,13 +116,48 @@ def parse_code_file(file_path: str, extract_full_code: bool = False) -> Optional
 
     return module_info
 
+def _extract_function_info(node: ast.FunctionDef) -> Dict[str, Any]:
+    """Extract name, docstring, decorators and argument names for a function or method."""
+    return {
+        "name": node.name,
+        "docstring": _get_docstring(node),
+        "decorators": [_get_name_from_node(dec) for dec in node.decorator_list],
+        "args": [arg.arg for arg in node.args.args]
+    }
+
+def _is_private(name: str) -> bool:
+    """Check for a _private name; dunder names such as __init__ are public."""
+    return name.startswith("_") and not (name.startswith("__") and name.endswith("__"))
+
+def _get_docstring(node) -> Optional[str]:
+    """
+    Return the cleaned docstring of a module, class or function node.
+    
+    Same result as ast.get_docstring, but one-line docstrings skip inspect.cleandoc,
+    which only matters for multi-line text.
+    """
+    body = node.body
+    if not (body and isinstance(body[0], ast.Expr)):
+        return None
+    value = body[0].value
+    if not (isinstance(value, ast.Constant) and isinstance(value.value, str)):
+        return None
+    text = value.value
+    if "\n" not in text:
+        return text.expandtabs().lstrip()
+    return inspect.cleandoc(text)
+
 def _get_name_from_node(node) -> str:
     """Helper to extract name from AST node."""
+    # Walk dotted attribute chains (a.b.c) iteratively instead of recursing per level
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
     if isinstance(node, ast.Name):
-        return node.id
-    elif isinstance(node, ast.Attribute):
-        return f"{_get_name_from_node(node.value)}.{node.attr}"
+        parts.append(node.id)
     elif isinstance(node, ast.Constant):
-        return str(node.value)
+        parts.append(str(node.value))
     else:
-        return str(node)
+        parts.append(ast.unparse(node))
+    return ".".join(reversed(parts))
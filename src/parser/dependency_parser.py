@@ -1,7 +1,47 @@
 import ast
+import os
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatch
+from itertools import chain
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Set, Tuple
+
+from .parse_cache import cached_parse
+from .project_files import find_setup_call, load_source_tree, load_toml, read_text, scan_project_files
+
+# Patterns for the regex fallback used when setup.py cannot be parsed as Python:
+# the opening of the install_requires list, the tokens that matter when looking for
+# its closing bracket (strings and comments are skipped whole), and its string items
+_INSTALL_REQUIRES_RE = re.compile(r'install_requires\s*=\s*\[')
+_BRACKET_TOKEN_RE = re.compile(r'"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|#[^\n]*|[\[\]]')
+_QUOTED_STRING_RE = re.compile(r'["\']([^"\']+)["\']')
+
+# A requirements-file line holding a dependency: skips blank lines, comments and
+# pip options (-r, -e, ...) and captures the requirement without any inline comment.
+# Matched with findall over the whole file rather than line by line.
+_REQUIREMENT_LINE_RE = re.compile(r'^[ \t]*([^\s#-][^#\n]*?)[ \t\r]*(?:#[^\n]*)?$', re.M)
+
+# The "- item" lines following a "dependencies:" line of a conda environment file,
+# and the package names in them (nested "- pip:" headers are skipped, their items kept)
+_CONDA_DEPS_BLOCK_RE = re.compile(r'^[ \t]*dependencies:[ \t\r]*\n((?:[ \t]*-[^\n]*(?:\n|\Z))*)', re.M)
+_CONDA_DEP_ITEM_RE = re.compile(r'^[ \t]*- (?!pip:)[ \t]*(\S[^\n]*?)[ \t\r]*$', re.M)
+
+# The install_requires value of setup.cfg's [options] section: the rest of its
+# line plus every indented or blank continuation line
+_SETUP_CFG_INSTALL_REQUIRES_RE = re.compile(
+    r'^\[options\][ \t]*\r?\n(?:(?!\[)[^\n]*\n)*?install_requires[ \t]*[=:]([^\n]*(?:\n(?:[ \t][^\n]*|(?=\r?\n)))*)',
+    re.M,
+)
+
+# requirements*.txt, *-requirements.txt and the other common requirements file names
+_REQUIREMENTS_FILE_RE = re.compile(
+    r'^(?:requirements.*|[\w.-]+-requirements|reqs|deps|dependencies)\.txt$'
+)
+
+# Only dependency strings shorter than this are interned, bounding the intern table
+_INTERN_MAX_LEN = 40
 
 def parse_dependencies(project_path: str) -> List[str]:
     """
@@ -14,11 +54,23 @@ def parse_dependencies(project_path: str) -> List[str]:
     - environment.yml (conda)
     """
     project_path = Path(project_path).resolve()
-    dependencies = []
     
-    # Try each source in order of preference
+    # One directory listing answers every "does <file> exist" check below
+    try:
+        top_entries = {entry.name for entry in os.scandir(project_path)}
+    except OSError:
+        return []
+    
+    dependencies, pyproject_complete = _parse_pyproject_dependencies(project_path, top_entries)
+    
+    # A pyproject.toml with non-empty PEP 621 [project] dependencies is authoritative;
+    # legacy sources are only consulted if requirements files (or a requirements/
+    # directory) sit beside it, matched the same way _parse_requirements_files does
+    if pyproject_complete and not _has_requirements_files(project_path, top_entries):
+        return _dedupe(dependencies)
+    
+    # Try each remaining source in order of preference
     deps_sources = [
-        _parse_pyproject_dependencies,
         _parse_setup_py_dependencies,
         _parse_setup_cfg_dependencies,
         _parse_requirements_files,
@@ -26,114 +78,142 @@ def parse_dependencies(project_path: str) -> List[str]:
         _parse_conda_dependencies,
     ]
     
-    for parse_func in deps_sources:
-        deps = parse_func(project_path)
-        if deps:
-            dependencies.extend(deps)
-    
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_deps = []
-    for dep in dependencies:
-        if dep not in seen:
-            seen.add(dep)
-            unique_deps.append(dep)
+    # The sources are independent and mostly file I/O, so read them concurrently;
+    # map() yields results in source order, keeping the merge deterministic
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = executor.map(
+            lambda parse_func: parse_func(project_path, top_entries), deps_sources
+        )
+        return _dedupe(chain(dependencies, chain.from_iterable(results)))
+
+def _dedupe(items: Iterable[str]) -> List[str]:
+    """
+    Remove duplicates while preserving order.
     
-    return unique_deps
+    Short names are interned so the same dependency shares one string object
+    across projects parsed in the same process.
+    """
+    intern = sys.intern
+    # dict.fromkeys does the order-preserving de-duplication in C
+    return [
+        intern(item) if type(item) is str and len(item) < _INTERN_MAX_LEN else item
+        for item in dict.fromkeys(items)
+    ]
 
-def _parse_pyproject_dependencies(project_path: Path) -> List[str]:
-    """Parse dependencies from pyproject.toml (PEP 621 and Poetry)."""
+def _parse_pyproject_dependencies(project_path: Path, top_entries: Set[str]) -> Tuple[List[str], bool]:
+    """
+    Parse dependencies from pyproject.toml (PEP 621 and Poetry).
+    
+    Returns the dependencies and whether the file is authoritative, i.e. declares
+    non-empty PEP 621 [project] dependencies.
+    """
+    if "pyproject.toml" not in top_entries:
+        return [], False
     pyproject = project_path / "pyproject.toml"
-    if not pyproject.exists():
-        return []
     
     try:
-        import tomllib
-    except ImportError:
-        try:
-            import tomli as tomllib
-        except ImportError:
-            return []
+        dependencies, complete = cached_parse(
+            "dependencies:pyproject", pyproject, lambda: _read_pyproject_dependencies(pyproject)
+        )
+        return dependencies, complete
+    except Exception:
+        return [], False
+
+def _read_pyproject_dependencies(pyproject: Path) -> Tuple[List[str], bool]:
+    """Read the dependencies and completeness flag from pyproject.toml; errors are raised."""
+    data = load_toml(pyproject)
     
-    try:
-        with open(pyproject, "rb") as f:
-            data = tomllib.load(f)
-        
-        dependencies = []
-        
-        # PEP 621 project dependencies
-        project = data.get("project", {})
-        if "dependencies" in project:
-            dependencies.extend(project["dependencies"])
-        
-        # Optional dependencies
-        if "optional-dependencies" in project:
-            for group_deps in project["optional-dependencies"].values():
-                dependencies.extend(group_deps)
-        
-        # Poetry dependencies
-        poetry = data.get("tool", {}).get("poetry", {})
-        if "dependencies" in poetry:
-            poetry_deps = poetry["dependencies"]
-            for name, spec in poetry_deps.items():
-                if name != "python":  # Skip Python version
-                    if isinstance(spec, str):
-                        dependencies.append(f"{name}{spec}")
-                    elif isinstance(spec, dict) and "version" in spec:
-                        dependencies.append(f"{name}{spec['version']}")
-                    else:
-                        dependencies.append(name)
-        
-        if "dev-dependencies" in poetry:
-            dev_deps = poetry["dev-dependencies"]
-            for name, spec in dev_deps.items():
-                if isinstance(spec, str):
-                    dependencies.append(f"{name}{spec}")
-                elif isinstance(spec, dict) and "version" in spec:
-                    dependencies.append(f"{name}{spec['version']}")
-                else:
-                    dependencies.append(name)
-        
-        return dependencies
+    dependencies = []
         
-    except Exception:
-        return []
+    # PEP 621 project dependencies
+    project = data.get("project", {})
+    if "dependencies" in project:
+        dependencies.extend(project["dependencies"])
+    
+    # Optional dependencies
+    if "optional-dependencies" in project:
+        for group_deps in project["optional-dependencies"].values():
+            dependencies.extend(group_deps)
+    
+    # Poetry dependencies
+    poetry = data.get("tool", {}).get("poetry", {})
+    if "dependencies" in poetry:
+        dependencies.extend(_convert_toml_deps(poetry["dependencies"]))
+    
+    if "dev-dependencies" in poetry:
+        dependencies.extend(_convert_toml_deps(poetry["dev-dependencies"]))
+    
+    complete = bool(project.get("dependencies"))
+    return dependencies, complete
 
-def _parse_setup_py_dependencies(project_path: Path) -> List[str]:
+def _convert_toml_deps(deps: Dict[str, Any]) -> List[str]:
+    """
+    Convert a Poetry or Pipfile ``name = spec`` table into requirement strings.
+    
+    Specs may be a version string or a table with optional "version" and "extras"
+    keys; extras render as ``name[extra,...]`` and a "*" version adds no constraint.
+    """
+    converted = []
+    for name, spec in deps.items():
+        if name == "python":  # Skip Python version
+            continue
+        extras = None
+        if isinstance(spec, str):
+            version = spec
+        elif isinstance(spec, dict):
+            version = spec.get("version", "")
+            extras = spec.get("extras")
+        else:
+            version = ""
+        if version == "*":
+            version = ""
+        if extras:
+            converted.append(f"{name}[{','.join(extras)}]{version}")
+        else:
+            converted.append(f"{name}{version}")
+    return converted
+
+def _parse_setup_py_dependencies(project_path: Path, top_entries: Set[str]) -> List[str]:
     """Parse dependencies from setup.py."""
-    setup_py = project_path / "setup.py"
-    if not setup_py.exists():
+    if "setup.py" not in top_entries:
         return []
+    setup_py = project_path / "setup.py"
     
     try:
-        with open(setup_py, "r", encoding="utf-8") as f:
-            content = f.read()
-        
-        try:
-            tree = ast.parse(content)
-            return _extract_setup_dependencies_ast(tree)
-        except:
-            return _extract_setup_dependencies_regex(content)
-            
+        return cached_parse(
+            "dependencies:setup_py", setup_py, lambda: _read_setup_py_dependencies(setup_py)
+        )
     except Exception:
         return []
 
+def _read_setup_py_dependencies(setup_py: Path) -> List[str]:
+    """Read install_requires from setup.py, by AST or else by regex; read errors are raised."""
+    content = read_text(setup_py)
+    
+    # Stub setup.py files without install_requires/requires need no parsing
+    if "requires" not in content:
+        return []
+    
+    try:
+        _, tree = load_source_tree(setup_py)
+        return _extract_setup_dependencies_ast(tree)
+    except Exception:
+        return _extract_setup_dependencies_regex(content)
+
 def _extract_setup_dependencies_ast(tree: ast.AST) -> List[str]:
     """Extract dependencies from setup() call using AST."""
     dependencies = []
     
-    for node in ast.walk(tree):
-        if (isinstance(node, ast.Call) 
-            and getattr(node.func, "id", "") == "setup"):
-            
-            for kw in node.keywords:
-                if kw.arg in ("install_requires", "requires"):
-                    if isinstance(kw.value, (ast.List, ast.Tuple)):
-                        for elt in kw.value.elts:
-                            if isinstance(elt, ast.Constant):
-                                dependencies.append(elt.value)
-                            elif isinstance(elt, ast.Str):  # Python < 3.8
-                                dependencies.append(elt.s)
+    node = find_setup_call(tree)
+    if node is not None:
+        for kw in node.keywords:
+            if kw.arg in ("install_requires", "requires"):
+                if isinstance(kw.value, (ast.List, ast.Tuple)):
+                    # Only string literals are requirements; skips e.g. True or None
+                    dependencies.extend([
+                        elt.value for elt in kw.value.elts
+                        if isinstance(elt, ast.Constant) and isinstance(elt.value, str)
+                    ])
     
     return dependencies
 
@@ -142,141 +222,145 @@ def _extract_setup_dependencies_regex(content: str) -> List[str]:
     dependencies = []
     
     # Look for install_requires
-    install_requires_pattern = r'install_requires\s*=\s*\[(.*?)\]'
-    match = re.search(install_requires_pattern, content, re.DOTALL)
+    match = _INSTALL_REQUIRES_RE.search(content)
     if match:
-        deps_str = match.group(1)
+        deps_str = content[match.end():_find_closing_bracket(content, match.end())]
         # Extract quoted strings
-        dep_pattern = r'["\']([^"\']+)["\']'
-        dependencies.extend(re.findall(dep_pattern, deps_str))
+        dependencies.extend(_QUOTED_STRING_RE.findall(deps_str))
     
     return dependencies
 
-def _parse_setup_cfg_dependencies(project_path: Path) -> List[str]:
+def _find_closing_bracket(content: str, start: int) -> int:
+    """
+    Find the "]" closing a list whose "[" ends just before start.
+    
+    Brackets inside strings (e.g. "pkg[extra]") and comments are ignored. Returns
+    len(content) if the list is never closed.
+    """
+    depth = 1
+    for token in _BRACKET_TOKEN_RE.finditer(content, start):
+        bracket = token.group()
+        if bracket == "[":
+            depth += 1
+        elif bracket == "]":
+            depth -= 1
+            if depth == 0:
+                return token.start()
+    return len(content)
+
+def _parse_setup_cfg_dependencies(project_path: Path, top_entries: Set[str]) -> List[str]:
     """Parse dependencies from setup.cfg."""
-    setup_cfg = project_path / "setup.cfg"
-    if not setup_cfg.exists():
+    if "setup.cfg" not in top_entries:
         return []
+    setup_cfg = project_path / "setup.cfg"
     
     try:
+        content = read_text(setup_cfg)
+        if "install_requires" not in content:
+            return []
+        
+        # Fast path for the usual layout; anything unusual goes through configparser
+        match = _SETUP_CFG_INSTALL_REQUIRES_RE.search(content)
+        if match:
+            return [
+                dep for dep in (line.strip() for line in match.group(1).splitlines())
+                if dep and not dep.startswith(("#", ";"))
+            ]
+        
         import configparser
-        config = configparser.ConfigParser()
-        config.read(setup_cfg)
+        config = configparser.RawConfigParser()
+        config.read_string(content, source=str(setup_cfg))
         
         dependencies = []
         if 'options' in config and 'install_requires' in config['options']:
             deps_str = config['options']['install_requires']
             # Split by newlines and clean up
-            deps = [dep.strip() for dep in deps_str.split('\n') if dep.strip()]
+            deps = [dep.strip() for dep in deps_str.splitlines() if dep.strip()]
             dependencies.extend(deps)
         
         return dependencies
     except Exception:
         return []
 
-def _parse_requirements_files(project_path: Path) -> List[str]:
+def _parse_requirements_files(project_path: Path, top_entries: Set[str]) -> List[str]:
     """Parse dependencies from requirements files."""
     dependencies = []
     
-    # Common requirements file patterns
-    req_patterns = [
-        "requirements.txt",
-        "requirements*.txt", 
-        "reqs.txt",
-        "deps.txt",
-        "dependencies.txt",
-        "dev-requirements.txt",
-        "test-requirements.txt"
-    ]
-    
-    req_files = []
-    for pattern in req_patterns:
-        req_files.extend(list(project_path.glob(pattern)))
-        req_files.extend(list(project_path.glob(f"**/{pattern}")))
-    
-    for req_file in req_files:
-        if req_file.is_file():
-            try:
-                with open(req_file, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        # Skip empty lines and comments
-                        if line and not line.startswith('#') and not line.startswith('-'):
-                            # Remove inline comments
-                            dep = line.split('#')[0].strip()
-                            if dep:
-                                dependencies.append(dep)
-            except Exception:
+    for req_file in _find_requirements_files(project_path):
+        try:
+            # DirEntry.stat() is cached, so the size check and the read share one stat call
+            st = req_file.stat()
+            if st.st_size == 0:
                 continue
+            dependencies.extend(_REQUIREMENT_LINE_RE.findall(read_text(req_file.path, st)))
+        except Exception:
+            continue
     
     return dependencies
 
-def _parse_pipfile_dependencies(project_path: Path) -> List[str]:
+def _find_requirements_files(project_path: Path) -> List[os.DirEntry]:
+    """
+    Find requirements files anywhere in the project with a single directory walk.
+    Also picks up every .txt file inside a requirements/ directory.
+    """
+    return scan_project_files(project_path, _is_requirements_file)
+
+def _has_requirements_files(project_path: Path, top_entries: Set[str]) -> bool:
+    """Check the project root for requirements files or a requirements/ directory."""
+    if "requirements" in top_entries:
+        return True
+    root = str(project_path)
+    return any(_is_requirements_file(root, name) for name in top_entries)
+
+def _is_requirements_file(dir_path: str, name: str) -> bool:
+    """Check whether a file name looks like a requirements file."""
+    if _REQUIREMENTS_FILE_RE.match(name):
+        return True
+    return name.endswith(".txt") and os.path.basename(dir_path) == "requirements"
+
+def _parse_pipfile_dependencies(project_path: Path, top_entries: Set[str]) -> List[str]:
     """Parse dependencies from Pipfile."""
-    pipfile = project_path / "Pipfile"
-    if not pipfile.exists():
+    if "Pipfile" not in top_entries:
         return []
+    pipfile = project_path / "Pipfile"
     
     try:
-        import tomllib
-    except ImportError:
-        try:
-            import tomli as tomllib
-        except ImportError:
-            return []
-    
-    try:
-        with open(pipfile, "rb") as f:
-            data = tomllib.load(f)
-        
-        dependencies = []
-        
-        # Regular packages
-        if "packages" in data:
-            for name, spec in data["packages"].items():
-                if isinstance(spec, str):
-                    dependencies.append(f"{name}{spec}")
-                else:
-                    dependencies.append(name)
-        
-        # Dev packages
-        if "dev-packages" in data:
-            for name, spec in data["dev-packages"].items():
-                if isinstance(spec, str):
-                    dependencies.append(f"{name}{spec}")
-                else:
-                    dependencies.append(name)
-        
-        return dependencies
-        
+        return cached_parse("dependencies:pipfile", pipfile, lambda: _read_pipfile_dependencies(pipfile))
     except Exception:
         return []
 
-def _parse_conda_dependencies(project_path: Path) -> List[str]:
+def _read_pipfile_dependencies(pipfile: Path) -> List[str]:
+    """Read packages and dev-packages from a Pipfile; errors are raised."""
+    data = load_toml(pipfile)
+    
+    dependencies = []
+    
+    # Regular packages
+    if "packages" in data:
+        dependencies.extend(_convert_toml_deps(data["packages"]))
+    
+    # Dev packages
+    if "dev-packages" in data:
+        dependencies.extend(_convert_toml_deps(data["dev-packages"]))
+    
+    return dependencies
+
+def _parse_conda_dependencies(project_path: Path, top_entries: Set[str]) -> List[str]:
     """Parse dependencies from conda environment files."""
     dependencies = []
     
-    env_files = list(project_path.glob("environment*.yml")) + list(project_path.glob("environment*.yaml"))
+    env_files = [
+        project_path / name
+        for pattern in ("environment*.yml", "environment*.yaml")
+        for name in sorted(top_entries)
+        if fnmatch(name, pattern)
+    ]
     
     for env_file in env_files:
         try:
-            with open(env_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Simple parsing for dependencies section
-            in_deps = False
-            for line in content.split('\n'):
-                line = line.strip()
-                if line == "dependencies:":
-                    in_deps = True
-                    continue
-                elif in_deps:
-                    if line.startswith('- ') and not line.startswith('- pip:'):
-                        dep = line[2:].strip()
-                        if dep:
-                            dependencies.append(dep)
-                    elif not line.startswith(' ') and not line.startswith('-'):
-                        in_deps = False
+            # Each "dependencies:" block runs until the first line that is not a "-" item
+            for block in _CONDA_DEPS_BLOCK_RE.finditer(read_text(env_file)):
+                dependencies.extend(_CONDA_DEP_ITEM_RE.findall(block.group(1)))
         except Exception:
             continue
     
@@ -4,9 +4,39 @@ These are crucial for generating usage instructions in READMEs.
 """
 
 import ast
+import inspect
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatch
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List, Optional
+
+from .parse_cache import cached_parse
+from .project_files import find_project_files, find_setup_call, load_source_tree, load_toml, read_text
+
+# Entry points are searched for in the project root, top-level directories and the
+# packages below them, at most this many levels deep, skipping these directories
+_ENTRY_POINT_SEARCH_DEPTH = 4
+_ENTRY_POINT_SKIPPED_DIRS = {"tests", "test", "build", "dist"}
+
+# File name patterns of scripts that commonly hold a command-line interface
+_CLI_PATTERNS = ("cli.py", "main.py", "*_cli.py", "run.py", "app.py")
+
+# A module docstring: a triple-quoted string (optionally r/u-prefixed) that is the
+# first statement, preceded only by blank and comment lines and alone on its last line.
+# The body stops at the first closing delimiter, so a string that is only the start
+# of a longer expression (e.g. `"""...""" % x`) does not match
+_MODULE_DOCSTRING_RE = re.compile(
+    r'(?:[ \t]*(?:#[^\n]*)?\n)*(?P<prefix>[rRuU]?)(?P<quote>"""|\'\'\')(?P<body>(?:(?!(?P=quote)).)*)(?P=quote)[ \t]*(?:#[^\n]*)?(?:\n|\Z)',
+    re.S,
+)
+
+# Any of these in a script's source marks it as a CLI: argparse, a __main__ guard
+# (either quote style), sys.argv, click or typer. One regex scans the source once.
+_CLI_INDICATOR_RE = re.compile(
+    r"argparse|ArgumentParser|if __name__ ?== ?['\"]__main__['\"]|sys\.argv|click|typer"
+)
 
 def parse_entry_points(project_path: str) -> Dict[str, Any]:
     """
@@ -21,51 +51,82 @@ def parse_entry_points(project_path: str) -> Dict[str, Any]:
         "package_entry_points": []
     }
     
-    # Find main modules (__main__.py files)
-    main_files = list(project_path.glob("**/__main__.py"))
-    for main_file in main_files:
-        entry_info = _extract_main_module_info(main_file)
+    # One walk finds both __main__.py files and CLI scripts (common patterns). Scripts
+    # live at the top level or inside packages, so below the top-level directories
+    # only packages are searched, a few levels deep
+    main_files = []
+    cli_files = []
+    candidates = find_project_files(
+        project_path,
+        _is_entry_point_candidate,
+        max_depth=_ENTRY_POINT_SEARCH_DEPTH,
+        package_depth=1,
+        skipped_dirs=_ENTRY_POINT_SKIPPED_DIRS,
+    )
+    for found in candidates:
+        if found.name == "__main__.py":
+            main_files.append(found)
+        else:
+            cli_files.append(found)
+    
+    # Keep CLI scripts grouped by pattern, in the order the patterns are listed
+    cli_files.sort(key=lambda found: _cli_pattern_index(found.name))
+    
+    # Candidate files are independent and reading them is mostly I/O, so read them
+    # concurrently; map() keeps the results in file order
+    jobs = [("main_modules", _extract_main_module_info, main_file) for main_file in main_files]
+    jobs += [("cli_scripts", _extract_cli_script_info, cli_file) for cli_file in cli_files]
+    if len(jobs) > 1:
+        with ThreadPoolExecutor(max_workers=min(8, len(jobs))) as executor:
+            results = list(executor.map(lambda job: _run_cached(*job), jobs))
+    else:
+        results = [_run_cached(*job) for job in jobs]
+    
+    for (category, _, _), entry_info in zip(jobs, results):
         if entry_info:
-            entry_points["main_modules"].append(entry_info)
-    
-    # Find CLI scripts (common patterns)
-    cli_patterns = ["cli.py", "main.py", "*_cli.py", "run.py", "app.py"]
-    for pattern in cli_patterns:
-        cli_files = list(project_path.glob(f"**/{pattern}"))
-        for cli_file in cli_files:
-            # Skip if already found as __main__.py
-            if cli_file.name == "__main__.py":
-                continue
-            entry_info = _extract_cli_script_info(cli_file)
-            if entry_info:
-                entry_points["cli_scripts"].append(entry_info)
+            entry_points[category].append(entry_info)
     
     # Extract setup.py console scripts and entry points
     setup_py = project_path / "setup.py"
     if setup_py.exists():
-        setup_entry_points = _extract_setup_entry_points(setup_py)
+        setup_entry_points = _run_cached("setup_scripts", _extract_setup_entry_points, setup_py)
         entry_points["setup_scripts"].extend(setup_entry_points)
     
     # Extract pyproject.toml entry points
     pyproject_toml = project_path / "pyproject.toml"
     if pyproject_toml.exists():
-        pyproject_entry_points = _extract_pyproject_entry_points(pyproject_toml)
+        pyproject_entry_points = _run_cached(
+            "package_entry_points", _extract_pyproject_entry_points, pyproject_toml
+        )
         entry_points["package_entry_points"].extend(pyproject_entry_points)
     
     return entry_points
 
+def _run_cached(category: str, extract: Callable[[Path], Any], file_path: Path) -> Any:
+    """Run an extractor on one file through the on-disk parse cache (a no-op unless enabled)."""
+    return cached_parse(f"entry_points:{category}", file_path, lambda: extract(file_path))
+
+def _is_entry_point_candidate(dir_path: str, name: str) -> bool:
+    """Check whether a file name is __main__.py or matches a CLI script pattern."""
+    return name == "__main__.py" or _cli_pattern_index(name) < len(_CLI_PATTERNS)
+
+def _cli_pattern_index(name: str) -> int:
+    """Index of the first CLI pattern the file name matches, or len(_CLI_PATTERNS)."""
+    for index, pattern in enumerate(_CLI_PATTERNS):
+        if fnmatch(name, pattern):
+            return index
+    return len(_CLI_PATTERNS)
+
 def _extract_main_module_info(main_file: Path) -> Dict[str, Any]:
     """Extract information from __main__.py files."""
     try:
-        with open(main_file, 'r', encoding='utf-8') as f:
-            source = f.read()
+        source = read_text(main_file)
         
         return {
             "type": "main_module",
             "file": str(main_file),
             "usage": f"python -m {_get_package_name_from_main(main_file)}",
-            "source_code": source,
-            "docstring": _extract_module_docstring(source),
+            "docstring": _extract_module_docstring(source, main_file),
             "description": "Main module entry point"
         }
     except Exception:
@@ -74,8 +135,7 @@ def _extract_main_module_info(main_file: Path) -> Dict[str, Any]:
 def _extract_cli_script_info(cli_file: Path) -> Dict[str, Any]:
     """Extract information from CLI script files."""
     try:
-        with open(cli_file, 'r', encoding='utf-8') as f:
-            source = f.read()
+        source = read_text(cli_file)
         
         # Check if this looks like a CLI script
         if not _is_cli_script(source):
@@ -85,10 +145,9 @@ def _extract_cli_script_info(cli_file: Path) -> Dict[str, Any]:
             "type": "cli_script",
             "file": str(cli_file),
             "usage": f"python {cli_file.name}",
-            "source_code": source,
-            "docstring": _extract_module_docstring(source),
+            "docstring": _extract_module_docstring(source, cli_file),
             "description": "Command-line interface script",
-            "argument_parser": _extract_argument_parser_info(source)
+            "argument_parser": _extract_argument_parser_info(source, cli_file)
         }
     except Exception:
         return None
@@ -98,22 +157,17 @@ def _extract_setup_entry_points(setup_file: Path) -> List[Dict[str, Any]]:
     entry_points = []
     
     try:
-        with open(setup_file, 'r', encoding='utf-8') as f:
-            source = f.read()
-        
-        tree = ast.parse(source)
+        _, tree = load_source_tree(setup_file)
         
-        for node in ast.walk(tree):
-            if (isinstance(node, ast.Call) and 
-                getattr(node.func, "id", "") == "setup"):
-                
-                for kw in node.keywords:
-                    if kw.arg == "entry_points":
-                        # Extract entry points
-                        entry_points.extend(_parse_entry_points_dict(kw.value))
-                    elif kw.arg == "scripts":
-                        # Extract script files
-                        entry_points.extend(_parse_scripts_list(kw.value))
+        node = find_setup_call(tree)
+        if node is not None:
+            for kw in node.keywords:
+                if kw.arg == "entry_points":
+                    # Extract entry points
+                    entry_points.extend(_parse_entry_points_dict(kw.value))
+                elif kw.arg == "scripts":
+                    # Extract script files
+                    entry_points.extend(_parse_scripts_list(kw.value))
     except Exception:
         pass
     
@@ -124,16 +178,7 @@ def _extract_pyproject_entry_points(pyproject_file: Path) -> List[Dict[str, Any]
     entry_points = []
     
     try:
-        import tomllib
-    except ImportError:
-        try:
-            import tomli as tomllib
-        except ImportError:
-            return entry_points
-    
-    try:
-        with open(pyproject_file, "rb") as f:
-            data = tomllib.load(f)
+        data = load_toml(pyproject_file)
         
         # Check project.scripts
         project = data.get("project", {})
@@ -174,55 +219,77 @@ def _get_package_name_from_main(main_file: Path) -> str:
             return parts[main_index - 1]
     return main_file.parent.name
 
-def _extract_module_docstring(source: str) -> str:
-    """Extract module-level docstring."""
+def _load_module_tree(file_path: Path) -> Optional[ast.Module]:
+    """Return a Python file's AST, or None if it does not parse."""
     try:
-        tree = ast.parse(source)
-        return ast.get_docstring(tree) or ""
-    except Exception:
+        return load_source_tree(file_path)[1]
+    except (SyntaxError, ValueError):
+        return None
+
+def _extract_module_docstring(source: str, file_path: Path) -> str:
+    """
+    Extract module-level docstring.
+    
+    A plain triple-quoted docstring at the top of the file is read straight from the
+    source; anything the regex cannot be sure about falls back to the module's AST.
+    """
+    match = _MODULE_DOCSTRING_RE.match(source)
+    if match:
+        body = match.group("body")
+        raw = match.group("prefix") in ("r", "R")
+        # Escapes, CR line endings and undecodable bytes need the real parser. In a raw
+        # string a trailing backslash may have escaped the delimiter the regex stopped at
+        if ("\r" not in body and "\ufffd" not in body
+                and ("\\" not in body or (raw and not body.endswith("\\")))):
+            return inspect.cleandoc(body)
+    
+    tree = _load_module_tree(file_path)
+    if tree is None:
         return ""
+    return ast.get_docstring(tree) or ""
 
 def _is_cli_script(source: str) -> bool:
     """Check if source code looks like a CLI script."""
-    cli_indicators = [
-        "argparse",
-        "ArgumentParser",
-        "if __name__ == '__main__':",
-        "sys.argv",
-        "click",
-        "@click.command",
-        "typer"
-    ]
-    return any(indicator in source for indicator in cli_indicators)
-
-def _extract_argument_parser_info(source: str) -> Dict[str, Any]:
+    return _CLI_INDICATOR_RE.search(source) is not None
+
+def _extract_argument_parser_info(source: str, file_path: Path) -> Dict[str, Any]:
     """Extract information about argument parser from CLI script."""
+    # Look for ArgumentParser creation and argument definitions
+    parser_info = {
+        "program_name": None,
+        "description": None,
+        "arguments": []
+    }
+    
+    # Scripts that never mention ArgumentParser need no parse at all
+    if "ArgumentParser" not in source:
+        return parser_info
+    
+    tree = _load_module_tree(file_path)
+    if tree is None:
+        return {}
+    
     try:
-        tree = ast.parse(source)
-        
-        # Look for ArgumentParser creation and argument definitions
-        parser_info = {
-            "program_name": None,
-            "description": None,
-            "arguments": []
-        }
-        
-        for node in ast.walk(tree):
-            if (isinstance(node, ast.Call) and
-                isinstance(node.func, ast.Attribute) and
-                node.func.attr == "ArgumentParser"):
-                
-                # Extract ArgumentParser arguments
-                for kw in node.keywords:
-                    if kw.arg == "prog" and isinstance(kw.value, ast.Constant):
-                        parser_info["program_name"] = kw.value.value
-                    elif kw.arg == "description" and isinstance(kw.value, ast.Constant):
-                        parser_info["description"] = kw.value.value
+        # ast.walk is lazy, so next() stops at the first ArgumentParser(...) call
+        node = next((node for node in ast.walk(tree) if _is_argument_parser_call(node)), None)
+        if node is not None:
+            # Extract ArgumentParser arguments
+            for kw in node.keywords:
+                if kw.arg == "prog" and isinstance(kw.value, ast.Constant):
+                    parser_info["program_name"] = kw.value.value
+                elif kw.arg == "description" and isinstance(kw.value, ast.Constant):
+                    parser_info["description"] = kw.value.value
         
         return parser_info
     except Exception:
         return {}
 
+def _is_argument_parser_call(node: ast.AST) -> bool:
+    """Check whether a node is an `<module>.ArgumentParser(...)` call."""
+    return (isinstance(node, ast.Call) and
+            isinstance(node.func, ast.Attribute) and
+            node.func.attr == "ArgumentParser")
+
 def _parse_entry_points_dict(node) -> List[Dict[str, Any]]:
     """Parse entry_points dictionary from setup.py AST node."""
     # This would need more sophisticated AST parsing
@@ -234,7 +301,7 @@ def _parse_scripts_list(node) -> List[Dict[str, Any]]:
     scripts = []
     if isinstance(node, (ast.List, ast.Tuple)):
         for item in node.elts:
-            if isinstance(item, ast.Constant):
+            if isinstance(item, ast.Constant) and isinstance(item.value, str):
                 scripts.append({
                     "type": "script_file",
                     "file": item.value,
@@ -1,7 +1,25 @@
 import ast
 import re
-from pathlib import Path
-from typing import List, Dict, Any
+import textwrap
+from collections import deque
+from itertools import chain
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from .project_files import load_source_tree
+
+# Fenced markdown code block: captures the optional language tag and the body
+_FENCED_CODE_RE = re.compile(r'```(\w*)[ \t]*\n(.*?)```', re.DOTALL)
+# reStructuredText code directive line, e.g. ".. code-block:: python"
+_RST_CODE_DIRECTIVE_RE = re.compile(r'([ \t]*)\.\. (?:code-block|code|sourcecode)::[ \t]*(\S*)[ \t]*$')
+# Indented code following "Example:" or similar
+_INDENTED_EXAMPLE_RE = re.compile(r'(?:Example|Usage|Code):\s*\n((?:    .*\n?)+)', re.MULTILINE)
+# Header line opening an example section
+_EXAMPLE_SECTION_HEADER_RE = re.compile(r'\n\s*(?:Examples?|Usage|Sample Code):\s*\n', re.IGNORECASE)
+# Fields holding nested statements, in the order ast.walk visits them
+_STATEMENT_LIST_FIELDS = ('body', 'handlers', 'orelse', 'finalbody', 'cases')
+# Words marking a comment block as an example
+_COMMENT_EXAMPLE_KEYWORD_RE = re.compile(r'example|usage|sample|demo', re.IGNORECASE)
+# Characters and keywords that make a comment line look like code
+_CODE_LIKE_RE = re.compile(r'[=().]|import|from|def|class')
 
 def parse_examples(file_path: str) -> List[Dict[str, Any]]:
     """
@@ -12,100 +30,135 @@ def parse_examples(file_path: str) -> List[Dict[str, Any]]:
     - Function/class usage patterns
     - Comments with example code
     """
+    return list(_iter_examples(file_path))
+
+def _iter_examples(file_path: str) -> Iterator[Dict[str, Any]]:
+    """Lazily yield the examples parse_examples returns, in the same order."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            source = f.read()
-        tree = ast.parse(source)
+        source, tree = load_source_tree(file_path)
     except Exception:
-        return []
-    
-    examples = []
-    
-    # Extract from docstrings
-    examples.extend(_extract_docstring_examples(tree, file_path, source))
-    
-    # Extract main guard examples
-    examples.extend(_extract_main_guard_examples(tree, file_path, source))
-    
-    # Extract comment examples
-    examples.extend(_extract_comment_examples(source, file_path))
-    
-    # Extract usage patterns
-    examples.extend(_extract_usage_patterns(tree, file_path, source))
-    
-    return examples
+        return iter(())
+    
+    # Split once for every extractor that looks up lines. Not splitlines(): AST line
+    # numbers count only newlines (the decoded source has no \r), not e.g. form feeds
+    source_lines = source.split('\n')
+    # One traversal feeds both the docstring and the usage pattern extractors
+    definitions, assignments = _collect_statements(tree)
+    
+    return chain(
+        # Docstring examples
+        _extract_docstring_examples(tree, definitions, file_path),
+        # Main guard examples
+        _extract_main_guard_examples(tree, file_path, source_lines),
+        # Comment examples
+        _extract_comment_examples(source, source_lines, file_path),
+        # Usage patterns
+        _extract_usage_patterns(assignments, file_path, source_lines),
+    )
 
-def _extract_docstring_examples(tree: ast.AST, file_path: str, source: str) -> List[Dict[str, Any]]:
-    """Extract examples from docstrings (doctests and code blocks)."""
-    examples = []
-    
+def _extract_docstring_examples(
+    tree: ast.AST, definitions: List[ast.AST], file_path: str
+) -> Iterator[Dict[str, Any]]:
+    """Extract examples from the docstrings of the module and its classes and functions."""
     # Module docstring
     module_docstring = ast.get_docstring(tree)
     if module_docstring:
-        examples.extend(_parse_docstring_for_examples(module_docstring, file_path, "module"))
+        yield from _parse_docstring_for_examples(module_docstring, file_path, "module")
     
-    # Walk through all nodes
-    for node in ast.walk(tree):
+    for node in definitions:
         if isinstance(node, ast.ClassDef):
             class_docstring = ast.get_docstring(node)
             if class_docstring:
-                examples.extend(_parse_docstring_for_examples(
+                yield from _parse_docstring_for_examples(
                     class_docstring, file_path, f"class {node.name}"
-                ))
+                )
         elif isinstance(node, ast.FunctionDef):
             func_docstring = ast.get_docstring(node)
             if func_docstring:
-                examples.extend(_parse_docstring_for_examples(
+                yield from _parse_docstring_for_examples(
                     func_docstring, file_path, f"function {node.name}"
-                ))
-    
-    return examples
+                )
+
+def _collect_statements(tree: ast.AST) -> Tuple[List[ast.AST], List[ast.Assign]]:
+    """Gather the tree's class/function definitions and its assignments in one traversal."""
+    definitions = []
+    assignments = []
+    for node in _iter_statements(tree):
+        if isinstance(node, (ast.ClassDef, ast.FunctionDef)):
+            definitions.append(node)
+        elif isinstance(node, ast.Assign):
+            assignments.append(node)
+    return definitions, assignments
 
-def _parse_docstring_for_examples(docstring: str, file_path: str, context: str) -> List[Dict[str, Any]]:
+def _iter_statements(tree: ast.AST) -> Iterator[ast.AST]:
+    """
+    Yield the statements of tree in ast.walk order, without descending into expressions.
+
+    Definitions and assignments are always statements, so this finds the same nodes as
+    ast.walk while skipping the expression nodes that make up most of the tree.
+    Exception handlers and match cases are yielded too, as they hold statement bodies.
+    """
+    todo = deque([tree])
+    while todo:
+        node = todo.popleft()
+        for field in _STATEMENT_LIST_FIELDS:
+            value = getattr(node, field, None)
+            if value:
+                todo.extend(value)
+        yield node
+
+def _parse_docstring_for_examples(docstring: str, file_path: str, context: str) -> Iterator[Dict[str, Any]]:
     """Parse a docstring for various types of examples."""
-    examples = []
-    
     if not docstring:
-        return examples
+        return
+    
+    # Most docstrings hold no examples. Every extractor below needs a doctest prompt,
+    # a code fence or one of these words (its section headers and RST directives all
+    # contain them), so plain substring checks rule those docstrings out cheaply
+    if '>>>' not in docstring and '```' not in docstring:
+        lowered = docstring.lower()
+        if 'example' not in lowered and 'usage' not in lowered and 'code' not in lowered:
+            return
     
     # 1. Doctest examples (>>> format)
     doctest_examples = _extract_doctest_examples(docstring)
     for example in doctest_examples:
-        examples.append({
+        yield {
             "file": file_path,
             "context": context,
             "type": "doctest",
             "code": example,
             "language": "python"
-        })
+        }
     
     # 2. Code blocks (markdown style)
     code_blocks = _extract_code_blocks(docstring)
     for block in code_blocks:
-        examples.append({
+        yield {
             "file": file_path,
             "context": context,
             "type": "code_block",
             "code": block["code"],
             "language": block.get("language", "python")
-        })
+        }
     
     # 3. Example sections
     example_sections = _extract_example_sections(docstring)
     for section in example_sections:
-        examples.append({
+        yield {
             "file": file_path,
             "context": context,
             "type": "example_section",
             "code": section,
             "language": "python"
-        })
-    
-    return examples
+        }
 
 def _extract_doctest_examples(docstring: str) -> List[str]:
     """Extract doctest-style examples (>>> format)."""
     examples = []
+    # Most docstrings have no prompts; one substring check skips the line scan
+    if ">>>" not in docstring:
+        return examples
     current_example = []
     
     for line in docstring.splitlines():
@@ -129,24 +182,25 @@ def _extract_doctest_examples(docstring: str) -> List[str]:
     return examples
 
 def _extract_code_blocks(docstring: str) -> List[Dict[str, Any]]:
-    """Extract code blocks from markdown-style formatting."""
+    """Extract code blocks from markdown and reStructuredText formatting."""
     blocks = []
     
-    # Pattern for fenced code blocks
-    fenced_pattern = r'``````'
-    matches = re.findall(fenced_pattern, docstring, re.DOTALL)
-    
-    for language, code in matches:
-        blocks.append({
-            "code": code.strip(),
-            "language": language or "python"
-        })
-    
-    # Pattern for indented code blocks (following "Example:" or similar)
-    example_pattern = r'(?:Example|Usage|Code):\s*\n((?:    .*\n?)+)'
-    matches = re.findall(example_pattern, docstring, re.MULTILINE)
-    
-    for match in matches:
+    # Fenced code blocks
+    if '```' in docstring:
+        for language, code in _FENCED_CODE_RE.findall(docstring):
+            blocks.append({
+                "code": code.strip(),
+                "language": language or "python"
+            })
+    
+    # reStructuredText code-block directives
+    if '.. code' in docstring or '.. sourcecode' in docstring:
+        blocks.extend(_extract_rst_code_blocks(docstring))
+    
+    # Indented code blocks (following "Example:" or similar)
+    if 'Example:' not in docstring and 'Usage:' not in docstring and 'Code:' not in docstring:
+        return blocks
+    for match in _INDENTED_EXAMPLE_RE.findall(docstring):
         # Remove common indentation
         lines = match.split('\n')
         if lines:
@@ -165,76 +219,107 @@ def _extract_code_blocks(docstring: str) -> List[Dict[str, Any]]:
     
     return blocks
 
+def _extract_rst_code_blocks(docstring: str) -> List[Dict[str, Any]]:
+    """Extract the bodies of `.. code-block::` style directives."""
+    blocks = []
+    # Directive state: body is None outside a directive
+    body = None
+    indent = 0
+    language = "python"
+    
+    for line in docstring.split('\n'):
+        if body is not None:
+            # The body is every blank or more deeply indented line after the directive
+            if not line.strip() or len(line) - len(line.lstrip()) > indent:
+                body.append(line)
+                continue
+            _append_rst_code_block(blocks, body, language)
+            body = None
+        
+        match = _RST_CODE_DIRECTIVE_RE.match(line)
+        if match:
+            indent = len(match.group(1))
+            language = match.group(2) or "python"
+            body = []
+    
+    if body is not None:
+        _append_rst_code_block(blocks, body, language)
+    
+    return blocks
+
+def _append_rst_code_block(blocks: List[Dict[str, Any]], body: List[str], language: str) -> None:
+    """Add a directive's body to blocks, minus its options and common indentation."""
+    # Skip directive options such as ":linenos:" that precede the code
+    start = 0
+    while start < len(body) and body[start].lstrip().startswith(':'):
+        start += 1
+    code = textwrap.dedent('\n'.join(body[start:])).strip()
+    if code:
+        blocks.append({
+            "code": code,
+            "language": language
+        })
+
 def _extract_example_sections(docstring: str) -> List[str]:
     """Extract dedicated example sections."""
     examples = []
+    lowered = docstring.lower()
+    if 'example' not in lowered and 'usage' not in lowered and 'sample code' not in lowered:
+        return examples
     
     # Look for sections starting with "Examples:", "Example:", etc.
-    sections = re.split(r'\n\s*(Examples?|Usage|Sample Code):\s*\n', docstring, flags=re.IGNORECASE)
+    headers = list(_EXAMPLE_SECTION_HEADER_RE.finditer(docstring))
     
-    for i in range(1, len(sections), 2):  # Every other section starting from 1
-        if i + 1 < len(sections):
-            example_content = sections[i + 1].split('\n\n')[0]  # Take first paragraph
-            if example_content.strip():
-                examples.append(example_content.strip())
+    for i, header in enumerate(headers):
+        # A section runs up to the next header; only its first paragraph is taken
+        start = header.end()
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(docstring)
+        paragraph_end = docstring.find('\n\n', start, end)
+        example_content = docstring[start:end if paragraph_end == -1 else paragraph_end].strip()
+        if example_content:
+            examples.append(example_content)
     
     return examples
 
-def _extract_main_guard_examples(tree: ast.AST, file_path: str, source: str) -> List[Dict[str, Any]]:
+def _extract_main_guard_examples(tree: ast.Module, file_path: str, source_lines: List[str]) -> Iterator[Dict[str, Any]]:
     """Extract examples from if __name__ == '__main__': blocks."""
-    examples = []
-    
-    for node in ast.walk(tree):
-        if (isinstance(node, ast.If) and 
-            isinstance(node.test, ast.Compare) and
+    # A main guard only means something at module level, so only top-level statements are checked
+    for node in tree.body:
+        if isinstance(node, ast.If):
+            example = _main_guard_example(node, file_path, source_lines)
+            if example:
+                yield example
+
+def _main_guard_example(node: ast.If, file_path: str, source_lines: List[str]) -> Optional[Dict[str, Any]]:
+    """Extract the example from an if __name__ == '__main__': block."""
+    if not (isinstance(node.test, ast.Compare) and
             isinstance(node.test.left, ast.Name) and
             node.test.left.id == '__name__'):
-            
-            # Extract the code from the main guard
-            start_line = node.lineno - 1
-            end_line = node.end_lineno if hasattr(node, 'end_lineno') else start_line + 10
-            
-            source_lines = source.split('\n')
-            if start_line < len(source_lines):
-                # Find the actual end of the if block
-                main_guard_lines = []
-                indent_level = None
-                
-                for i in range(start_line, min(end_line, len(source_lines))):
-                    line = source_lines[i]
-                    if indent_level is None and line.strip():
-                        indent_level = len(line) - len(line.lstrip())
-                    
-                    if line.strip():  # Non-empty line
-                        current_indent = len(line) - len(line.lstrip())
-                        if current_indent >= indent_level:
-                            main_guard_lines.append(line)
-                        else:
-                            break
-                    else:
-                        main_guard_lines.append(line)
-                
-                if main_guard_lines:
-                    code = '\n'.join(main_guard_lines)
-                    examples.append({
-                        "file": file_path,
-                        "context": "main guard",
-                        "type": "main_example",
-                        "code": code.strip(),
-                        "language": "python"
-                    })
-    
-    return examples
+        return None
+    
+    # The node's line span is exactly the block, so slice it out of the source
+    code = '\n'.join(source_lines[node.lineno - 1:node.end_lineno]).strip()
+    if not code:
+        return None
+    return {
+        "file": file_path,
+        "context": "main guard",
+        "type": "main_example",
+        "code": code,
+        "language": "python"
+    }
 
-def _extract_comment_examples(source: str, file_path: str) -> List[Dict[str, Any]]:
+def _extract_comment_examples(source: str, source_lines: List[str], file_path: str) -> Iterator[Dict[str, Any]]:
     """Extract examples from comments."""
-    examples = []
+    # An example comment block must contain one of the keywords somewhere in the source
+    if not _COMMENT_EXAMPLE_KEYWORD_RE.search(source):
+        return
     
     # Look for comment blocks that contain example code
     comment_blocks = []
     current_block = []
     
-    for line in source.split('\n'):
+    for line in source_lines:
         stripped = line.strip()
         if stripped.startswith('#') and len(stripped) > 1:
             comment_text = stripped[1:].strip()
@@ -249,50 +334,52 @@ def _extract_comment_examples(source: str, file_path: str) -> List[Dict[str, Any
     
     # Look for example patterns in comment blocks
     for block in comment_blocks:
-        if any(keyword in block.lower() for keyword in ['example', 'usage', 'sample', 'demo']):
+        if _COMMENT_EXAMPLE_KEYWORD_RE.search(block):
             # Try to extract code-like content
             code_lines = []
             for line in block.split('\n'):
                 # Look for lines that look like code
-                if (any(char in line for char in ['=', '(', ')', '.', 'import', 'from', 'def', 'class']) 
-                    and not line.lower().startswith(('example', 'usage', 'sample', 'demo'))):
+                if (_CODE_LIKE_RE.search(line)
+                    and not _COMMENT_EXAMPLE_KEYWORD_RE.match(line)):
                     code_lines.append(line)
             
             if code_lines:
-                examples.append({
+                yield {
                     "file": file_path,
                     "context": "comment",
                     "type": "comment_example",
                     "code": '\n'.join(code_lines),
                     "language": "python"
-                })
-    
-    return examples
+                }
 
-def _extract_usage_patterns(tree: ast.AST, file_path: str, source: str) -> List[Dict[str, Any]]:
+def _extract_usage_patterns(
+    assignments: List[ast.Assign], file_path: str, source_lines: List[str]
+) -> Iterator[Dict[str, Any]]:
     """Extract common usage patterns from the code itself."""
-    examples = []
-    
     # Look for class instantiation patterns
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Assign):
-            # Look for assignments that might be examples
-            if (isinstance(node.value, ast.Call) and 
-                isinstance(node.value.func, ast.Name)):
-                
-                # Get the source code for this assignment
-                if hasattr(node, 'lineno'):
-                    line_no = node.lineno - 1
-                    source_lines = source.split('\n')
-                    if line_no < len(source_lines):
-                        line = source_lines[line_no].strip()
-                        if line and not line.startswith(('_', 'self.')):
-                            examples.append({
-                                "file": file_path,
-                                "context": "usage pattern",
-                                "type": "instantiation",
-                                "code": line,
-                                "language": "python"
-                            })
-    
-    return examples
+    for node in assignments:
+        example = _usage_example(node, file_path, source_lines)
+        if example:
+            yield example
+
+def _usage_example(node: ast.Assign, file_path: str, source_lines: List[str]) -> Optional[Dict[str, Any]]:
+    """Extract a usage pattern from an assignment such as `x = SomeClass(...)`."""
+    # Look for assignments that might be examples
+    if not (isinstance(node.value, ast.Call) and 
+            isinstance(node.value.func, ast.Name)):
+        return None
+    
+    # Get the source code for this assignment
+    if hasattr(node, 'lineno'):
+        line_no = node.lineno - 1
+        if line_no < len(source_lines):
+            line = source_lines[line_no].strip()
+            if line and not line.startswith(('_', 'self.')):
+                return {
+                    "file": file_path,
+                    "context": "usage pattern",
+                    "type": "instantiation",
+                    "code": line,
+                    "language": "python"
+                }
+    return None
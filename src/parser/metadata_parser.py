@@ -1,8 +1,30 @@
 import ast
-import os
 import re
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any
+
+from .project_files import find_setup_call, load_source_tree, load_toml, read_text
+
+# setup() keyword arguments recovered by regex when setup.py cannot be parsed
+_SETUP_FIELD_PATTERNS = {
+    'name': re.compile(r'name\s*=\s*["\']([^"\']+)["\']'),
+    'version': re.compile(r'version\s*=\s*["\']([^"\']+)["\']'),
+    'description': re.compile(r'description\s*=\s*["\']([^"\']+)["\']'),
+    'author': re.compile(r'author\s*=\s*["\']([^"\']+)["\']'),
+    'author_email': re.compile(r'author_email\s*=\s*["\']([^"\']+)["\']'),
+    'url': re.compile(r'url\s*=\s*["\']([^"\']+)["\']'),
+}
+
+# Dunder metadata variables commonly set in a package's __init__.py
+_INIT_FIELD_PATTERNS = {
+    'version': re.compile(r'__version__\s*=\s*["\']([^"\']+)["\']'),
+    'author': re.compile(r'__author__\s*=\s*["\']([^"\']+)["\']'),
+    'description': re.compile(r'__description__\s*=\s*["\']([^"\']+)["\']'),
+    'email': re.compile(r'__email__\s*=\s*["\']([^"\']+)["\']'),
+}
+
+# A markdown heading line; the README's first one becomes the description
+_README_HEADING_RE = re.compile(r'#\s*(.+)$')
 
 def parse_metadata(project_path: str) -> Dict[str, Any]:
     """
@@ -53,16 +75,7 @@ def _parse_pyproject_toml(project_path: Path) -> Dict[str, Any]:
         return {}
     
     try:
-        import tomllib
-    except ImportError:
-        try:
-            import tomli as tomllib
-        except ImportError:
-            return {}
-    
-    try:
-        with open(pyproject, "rb") as f:
-            data = tomllib.load(f)
+        data = load_toml(pyproject)
         
         project = data.get("project", {})
         metadata = {}
@@ -97,16 +110,13 @@ def _parse_setup_py(project_path: Path) -> Dict[str, Any]:
         return {}
     
     try:
-        with open(setup_py, "r", encoding="utf-8") as f:
-            content = f.read()
-        
         # Try to parse as AST first
         try:
-            tree = ast.parse(content)
+            _, tree = load_source_tree(setup_py)
             return _extract_setup_call_metadata(tree)
-        except:
+        except Exception:
             # Fallback to regex parsing
-            return _extract_setup_regex_metadata(content)
+            return _extract_setup_regex_metadata(read_text(setup_py))
             
     except Exception:
         return {}
@@ -115,17 +125,13 @@ def _extract_setup_call_metadata(tree: ast.AST) -> Dict[str, Any]:
     """Extract metadata from setup() call in AST."""
     metadata = {}
     
-    for node in ast.walk(tree):
-        if (isinstance(node, ast.Call) 
-            and getattr(node.func, "id", "") == "setup"):
-            
-            for kw in node.keywords:
-                if kw.arg in ("name", "version", "description", "author", 
-                             "author_email", "url", "license"):
-                    if isinstance(kw.value, ast.Constant):
-                        metadata[kw.arg] = kw.value.value
-                    elif isinstance(kw.value, ast.Str):  # Python < 3.8
-                        metadata[kw.arg] = kw.value.s
+    node = find_setup_call(tree)
+    if node is not None:
+        for kw in node.keywords:
+            if kw.arg in ("name", "version", "description", "author", 
+                         "author_email", "url", "license"):
+                if isinstance(kw.value, ast.Constant):
+                    metadata[kw.arg] = kw.value.value
     
     return metadata
 
@@ -133,17 +139,8 @@ def _extract_setup_regex_metadata(content: str) -> Dict[str, Any]:
     """Extract metadata using regex patterns."""
     metadata = {}
     
-    patterns = {
-        'name': r'name\s*=\s*["\']([^"\']+)["\']',
-        'version': r'version\s*=\s*["\']([^"\']+)["\']',
-        'description': r'description\s*=\s*["\']([^"\']+)["\']',
-        'author': r'author\s*=\s*["\']([^"\']+)["\']',
-        'author_email': r'author_email\s*=\s*["\']([^"\']+)["\']',
-        'url': r'url\s*=\s*["\']([^"\']+)["\']',
-    }
-    
-    for key, pattern in patterns.items():
-        match = re.search(pattern, content, re.MULTILINE)
+    for key, pattern in _SETUP_FIELD_PATTERNS.items():
+        match = pattern.search(content)
         if match:
             metadata[key] = match.group(1)
     
@@ -157,8 +154,8 @@ def _parse_setup_cfg(project_path: Path) -> Dict[str, Any]:
     
     try:
         import configparser
-        config = configparser.ConfigParser()
-        config.read(setup_cfg)
+        config = configparser.RawConfigParser()
+        config.read_string(read_text(setup_cfg), source=str(setup_cfg))
         
         metadata = {}
         if 'metadata' in config:
@@ -184,16 +181,9 @@ def _parse_init_files(project_path: Path) -> Dict[str, Any]:
                 content = f.read()
             
             # Look for common metadata variables
-            patterns = {
-                'version': r'__version__\s*=\s*["\']([^"\']+)["\']',
-                'author': r'__author__\s*=\s*["\']([^"\']+)["\']',
-                'description': r'__description__\s*=\s*["\']([^"\']+)["\']',
-                'email': r'__email__\s*=\s*["\']([^"\']+)["\']',
-            }
-            
-            for key, pattern in patterns.items():
+            for key, pattern in _INIT_FIELD_PATTERNS.items():
                 if not metadata.get(key):
-                    match = re.search(pattern, content)
+                    match = pattern.search(content)
                     if match:
                         metadata[key] = match.group(1)
         except Exception:
@@ -215,14 +205,13 @@ def _parse_readme(project_path: Path) -> Dict[str, Any]:
     for readme_file in readme_files:
         if readme_file.is_file():
             try:
+                # Extract title from first heading, reading only as far as it
                 with open(readme_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Extract title from first heading
-                if not metadata.get('description'):
-                    title_match = re.search(r'^#\s*(.+)$', content, re.MULTILINE)
-                    if title_match:
-                        metadata['description'] = title_match.group(1).strip()
+                    for line in f:
+                        title_match = _README_HEADING_RE.match(line)
+                        if title_match:
+                            metadata['description'] = title_match.group(1).strip()
+                            break
                 
                 break
             except Exception:
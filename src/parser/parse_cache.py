@@ -0,0 +1,117 @@
+"""
+Optional on-disk cache of per-file parse results, shared between runs.
+
+Results are stored as JSON in a SQLite database keyed by (path, kind) and are only
+returned while the file's mtime and size still match. The cache stays off until
+enable_parse_cache() is called, so importing the parsers never touches the disk.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever a cached parser's output changes, so stale results are discarded
+CACHE_VERSION = 4
+
+_connection: Optional[sqlite3.Connection] = None
+_lock = threading.Lock()
+
+def default_cache_path() -> Path:
+    """Cache database location: $XDG_CACHE_HOME/sysc4918, falling back to ~/.cache/sysc4918."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "sysc4918" / "parse-cache.sqlite"
+
+def enable_parse_cache(cache_path: Optional[Union[str, Path]] = None) -> bool:
+    """
+    Open (creating if needed) the cache database.
+
+    Returns False, leaving the cache disabled, if the database cannot be used.
+    """
+    global _connection
+    cache_path = Path(cache_path) if cache_path else default_cache_path()
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(cache_path), check_same_thread=False)
+        # It's only a cache: losing the last writes on a crash is fine
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=OFF")
+        if connection.execute("PRAGMA user_version").fetchone()[0] != CACHE_VERSION:
+            connection.execute("DROP TABLE IF EXISTS parse_cache")
+            connection.execute(f"PRAGMA user_version={CACHE_VERSION}")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS parse_cache ("
+            "path TEXT, kind TEXT, mtime_ns INTEGER, size INTEGER, payload TEXT, "
+            "PRIMARY KEY (path, kind))"
+        )
+        connection.commit()
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Parse cache disabled, cannot open {cache_path}: {e}")
+        return False
+
+    with _lock:
+        if _connection is not None:
+            _connection.close()
+        _connection = connection
+    return True
+
+def disable_parse_cache() -> None:
+    """Close the cache database; later parses run uncached."""
+    global _connection
+    with _lock:
+        if _connection is not None:
+            _connection.close()
+            _connection = None
+
+def cached_parse(
+    kind: str,
+    file_path: Union[str, Path],
+    parse: Callable[[], Any],
+    st: Optional[os.stat_result] = None,
+) -> Any:
+    """
+    Return parse()'s result for file_path, reusing the stored result while the file is unchanged.
+
+    kind names the parser, so one file can hold results from several parsers. Results
+    must be JSON-serializable to be stored; anything else is returned uncached.
+    """
+    connection = _connection
+    if connection is None:
+        return parse()
+
+    path = os.fspath(file_path)
+    try:
+        if st is None:
+            st = os.stat(path)
+        with _lock:
+            row = connection.execute(
+                "SELECT mtime_ns, size, payload FROM parse_cache WHERE path = ? AND kind = ?",
+                (path, kind),
+            ).fetchone()
+    except (OSError, sqlite3.Error):
+        return parse()
+
+    if row and row[0] == st.st_mtime_ns and row[1] == st.st_size:
+        return json.loads(row[2])
+
+    result = parse()
+    try:
+        payload = json.dumps(result)
+    except (TypeError, ValueError):
+        return result
+
+    try:
+        with _lock:
+            connection.execute(
+                "INSERT OR REPLACE INTO parse_cache VALUES (?, ?, ?, ?, ?)",
+                (path, kind, st.st_mtime_ns, st.st_size, payload),
+            )
+            connection.commit()
+    except sqlite3.Error:
+        pass
+    return result
@@ -0,0 +1,218 @@
+"""
+Cached loaders for the project files read by more than one parser.
+
+Every loader is keyed by (path, mtime_ns, size), so parse_dependencies,
+parse_entry_points and the code parsers share a single read/parse of files
+such as pyproject.toml and setup.py, and an edited file is simply reloaded.
+Returned objects are shared between callers and must not be mutated.
+"""
+
+import ast
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from importlib.util import decode_source
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+# Directories never searched for project files
+SKIPPED_DIRS = {'.git', '.hg', '.svn', '.tox', '.nox', '.venv', 'venv', '__pycache__', 'node_modules'}
+
+# Files at least this large are read through mmap
+MMAP_MIN_SIZE = 1024 * 1024
+
+# Deepest directory level (top-level directories are level 1) the file search enters
+MAX_SEARCH_DEPTH = 12
+
+def find_project_files(
+    project_path: Union[str, Path],
+    predicate: Callable[[str, str], bool],
+    max_depth: int = MAX_SEARCH_DEPTH,
+    package_depth: Optional[int] = None,
+    skipped_dirs: Iterable[str] = (),
+) -> List[Path]:
+    """
+    Walk the project once and return the files for which predicate(dir_path, name) is true.
+
+    See scan_project_files for the arguments.
+    """
+    return [
+        Path(entry.path)
+        for entry in scan_project_files(project_path, predicate, max_depth, package_depth, skipped_dirs)
+    ]
+
+def scan_project_files(
+    project_path: Union[str, Path],
+    predicate: Callable[[str, str], bool],
+    max_depth: int = MAX_SEARCH_DEPTH,
+    package_depth: Optional[int] = None,
+    skipped_dirs: Iterable[str] = (),
+) -> List[os.DirEntry]:
+    """
+    Walk the project once and return DirEntry objects for the files matching
+    predicate(dir_path, name). A DirEntry caches its stat(), so callers can size-check
+    and read a file without stat-ing it again.
+
+    VCS, virtualenv and cache directories (plus any skipped_dirs) are pruned, and
+    files come back in a deterministic top-down, sorted order. Top-level subtrees
+    are scanned concurrently, since directory listing releases the GIL.
+
+    Args:
+        max_depth: Deepest directory level searched; top-level directories are level 1
+        package_depth: If set, directories below this level are only searched when they
+            are Python packages (contain __init__.py), and the walk stops at the first
+            one that is not
+        skipped_dirs: Additional directory names to prune
+    """
+    skipped = SKIPPED_DIRS.union(skipped_dirs)
+    root = os.fspath(project_path)
+    entries = _list_dir(root)
+    if entries is None:
+        return []
+
+    # Classify entries the way os.walk does: symlinked directories are listed but not followed
+    matches = [entry for entry in entries if not entry.is_dir() and predicate(root, entry.name)]
+    if max_depth < 1:
+        return matches
+    subdirs = [
+        entry.path for entry in entries
+        if entry.is_dir(follow_symlinks=False) and entry.name not in skipped
+    ]
+
+    def scan(subdir: str) -> List[os.DirEntry]:
+        subtree_matches = []
+        _scan_subtree(subdir, 1, predicate, max_depth, package_depth, skipped, subtree_matches)
+        return subtree_matches
+
+    if len(subdirs) < 2:
+        results = [scan(subdir) for subdir in subdirs]
+    else:
+        workers = min(8, os.cpu_count() or 1, len(subdirs))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # map() keeps the subtrees in sorted order
+            results = list(executor.map(scan, subdirs))
+    for subtree_matches in results:
+        matches.extend(subtree_matches)
+    return matches
+
+def _scan_subtree(
+    dir_path: str,
+    depth: int,
+    predicate: Callable[[str, str], bool],
+    max_depth: int,
+    package_depth: Optional[int],
+    skipped: Set[str],
+    matches: List[os.DirEntry],
+) -> None:
+    """Collect matching files below one directory for scan_project_files, depth first."""
+    entries = _list_dir(dir_path)
+    if entries is None:
+        return
+    if package_depth is not None and depth > package_depth:
+        if not any(entry.name == "__init__.py" and not entry.is_dir() for entry in entries):
+            return
+
+    subdirs = []
+    for entry in entries:
+        if entry.is_dir():
+            if depth < max_depth and entry.name not in skipped and not entry.is_symlink():
+                subdirs.append(entry.path)
+        elif predicate(dir_path, entry.name):
+            matches.append(entry)
+    for subdir in subdirs:
+        _scan_subtree(subdir, depth + 1, predicate, max_depth, package_depth, skipped, matches)
+
+def _list_dir(dir_path: str) -> Optional[List[os.DirEntry]]:
+    """List a directory sorted by name, or None if it cannot be read."""
+    try:
+        with os.scandir(dir_path) as it:
+            return sorted(it, key=lambda entry: entry.name)
+    except OSError:
+        return None
+
+def read_text(file_path: Union[str, Path], st: Optional[os.stat_result] = None) -> str:
+    """
+    Read a text file, decoding it once as UTF-8.
+
+    Undecodable bytes are replaced rather than failing the whole file. Pass st when the
+    file's stat result is already at hand (e.g. from DirEntry.stat()) to skip re-stat-ing it.
+    """
+    path, mtime_ns, size = _stat_key(file_path, st)
+    return _read_text(path, mtime_ns, size)
+
+def load_toml(file_path: Union[str, Path]) -> Dict[str, Any]:
+    """Load a TOML file. Raises ImportError when no TOML library is available."""
+    path, mtime_ns, size = _stat_key(file_path)
+    return _load_toml(path, mtime_ns, size)
+
+def load_source_tree(file_path: Union[str, Path]) -> Tuple[str, ast.Module]:
+    """
+    Read and parse a Python file, returning its decoded source and AST.
+
+    Errors from reading or parsing are raised to the caller.
+    """
+    path, mtime_ns, size = _stat_key(file_path)
+    return _load_source_tree(path, mtime_ns, size)
+
+def find_setup_call(tree: ast.Module) -> Optional[ast.Call]:
+    """Find the setup() call, checking top-level statements before walking the whole tree."""
+    for stmt in tree.body:
+        if isinstance(stmt, ast.Expr) and _is_setup_call(stmt.value):
+            return stmt.value
+
+    # setup() can also be nested, e.g. under `if __name__ == "__main__":` or in main()
+    for node in ast.walk(tree):
+        if _is_setup_call(node):
+            return node
+    return None
+
+def _is_setup_call(node: ast.AST) -> bool:
+    return isinstance(node, ast.Call) and getattr(node.func, "id", "") == "setup"
+
+def _stat_key(file_path: Union[str, Path], st: Optional[os.stat_result] = None) -> Tuple[str, int, int]:
+    path = os.fspath(file_path)
+    if st is None:
+        st = os.stat(path)
+    return path, st.st_mtime_ns, st.st_size
+
+@lru_cache(maxsize=256)
+def _read_text(path: str, mtime_ns: int, size: int) -> str:
+    with open(path, "rb") as f:
+        if size >= MMAP_MIN_SIZE:
+            # Decode straight from the page cache instead of first copying into a bytes object
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return _decode_utf8(mm)
+        return _decode_utf8(f.read())
+
+def _decode_utf8(data: Any) -> str:
+    try:
+        return str(data, "utf-8")
+    except UnicodeDecodeError:
+        return str(data, "utf-8", "replace")
+
+@lru_cache(maxsize=64)
+def _load_toml(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    if tomllib is None:
+        raise ImportError("tomllib or tomli is required to read TOML files")
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+@lru_cache(maxsize=64)
+def _load_source_tree(path: str, mtime_ns: int, size: int) -> Tuple[str, ast.Module]:
+    # Parse the raw bytes so the compiler handles any PEP 263 encoding cookie itself,
+    # then decode once (honouring the same cookie) for the text-based extractors.
+    with open(path, "rb") as f:
+        data = f.read()
+    # compile() with PyCF_ONLY_AST is what ast.parse wraps; calling it directly skips
+    # the wrapper, and dont_inherit keeps this module's __future__ flags out of the parse
+    tree = compile(data, path, "exec", ast.PyCF_ONLY_AST, dont_inherit=True)
+    return decode_source(data), tree
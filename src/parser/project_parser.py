@@ -1,5 +1,8 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 from .metadata_parser import parse_metadata
 from .dependency_parser import parse_dependencies
 from .structure_parser import parse_structure
@@ -7,16 +10,19 @@ from .example_parser import parse_examples
 from .code_parser import parse_code_file
 from .entry_point_parser import parse_entry_points
 
+# Below this many files, process start-up costs more than parallel parsing saves.
+PARALLEL_MIN_FILES = 32
+
 def _is_test_file(file_path: str) -> bool:
         """Check if a file is a test file based on naming conventions."""
-        path = Path(file_path)
+        dir_path, file_name = os.path.split(file_path)
         
         # Check if file is in a test directory
-        if any(part.lower() in ('test', 'tests') for part in path.parts[:-1]):
+        if any(part.lower() in ('test', 'tests') for part in os.path.normpath(dir_path).split(os.sep)):
             return True
         
         # Check if filename suggests it's a test
-        name = path.stem.lower()
+        name = os.path.splitext(file_name)[0].lower()
         if name.startswith('test_') or name.endswith('_test') or name == 'test':
             return True
         
@@ -60,23 +66,29 @@ def parse_project(
                 if 'file' in ep:
                     entry_point_files.add(ep['file'])
     
-    for module_basic in structure:
-        file_path = module_basic["file"]
-        
-        # Extract full code for entry points
-        is_entry_point = file_path in entry_point_files or _is_likely_entry_point(file_path)
-        
-        # Get detailed code information
-        code_details = parse_code_file(file_path, extract_full_code=is_entry_point)
-        
+    file_paths = [module_basic["file"] for module_basic in structure]
+    
+    # Extract full code for entry points
+    full_code_flags = [
+        file_path in entry_point_files or _is_likely_entry_point(file_path)
+        for file_path in file_paths
+    ]
+    
+    parsed_files = _parse_module_files(file_paths, full_code_flags, include_private)
+    
+    # The same snippet (e.g. a shared doctest or `config = Config()`) often turns up
+    # in many files; keep only its first occurrence
+    seen_example_code = set()
+    for module_basic, (code_details, file_examples) in zip(structure, parsed_files):
         if code_details:
             detailed_modules.append(code_details)
         else:
             detailed_modules.append(module_basic)
         
-        # Extract examples from this file
-        file_examples = parse_examples(file_path)
-        all_examples.extend(file_examples)
+        for example in file_examples:
+            if example["code"] not in seen_example_code:
+                seen_example_code.add(example["code"])
+                all_examples.append(example)
 
     # Calculate comprehensive stats
     total_classes = sum(len(mod.get("classes", [])) for mod in detailed_modules)
@@ -103,9 +115,48 @@ def parse_project(
         }
     }
 
+def _parse_module_file(
+    file_path: str, extract_full_code: bool, include_private: bool
+) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Parse code details and examples for one file (runs in a worker process)."""
+    code_details = parse_code_file(
+        file_path,
+        extract_full_code=extract_full_code,
+        include_private=include_private
+    )
+    return code_details, parse_examples(file_path)
+
+def _parse_module_files(
+    file_paths: List[str], full_code_flags: List[bool], include_private: bool
+) -> List[Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]]:
+    """
+    Parse files in parallel across processes; AST parsing is CPU-bound and holds the GIL.
+    Small projects, single-CPU machines and platforms without working process pools
+    are parsed serially.
+    """
+    cpu_count = os.cpu_count() or 1
+    if len(file_paths) >= PARALLEL_MIN_FILES and cpu_count > 1:
+        try:
+            workers = min(cpu_count, len(file_paths))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(
+                    _parse_module_file,
+                    file_paths,
+                    full_code_flags,
+                    [include_private] * len(file_paths),
+                    # About four chunks per worker balances IPC overhead against stragglers
+                    chunksize=max(1, len(file_paths) // (workers * 4))
+                ))
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            pass
+    return [
+        _parse_module_file(file_path, flag, include_private)
+        for file_path, flag in zip(file_paths, full_code_flags)
+    ]
+
 def _is_likely_entry_point(file_path: str) -> bool:
     """Check if a file is likely an entry point based on naming patterns."""
-    file_name = Path(file_path).name
+    file_name = os.path.basename(file_path)
     entry_patterns = [
         "main.py", "cli.py", "__main__.py", "run.py", "app.py", 
         "start.py", "launch.py", "execute.py"
@@ -18,10 +18,9 @@ def parse_structure(project_path):
 
         for file in files:
             if file.endswith(".py"):
-                full_path = Path(root) / file
                 modules.append({
-                    "file": str(full_path.resolve()),
-                    "name": full_path.stem
+                    "file": os.path.realpath(os.path.join(root, file)),
+                    "name": file[:-3]
                 })
 
     return modules
@@ -28,6 +28,29 @@ except ImportError as e:
     print(f"❌ Error: Could not import parsing modules: {e}")
     sys.exit(1)
 
+# Patterns used per line or per heading, compiled once
+_SETEXT_H1_RE = re.compile(r'^=+$')
+_SETEXT_H2_RE = re.compile(r'^-+$')
+_VERSION_RE = re.compile(r'v?\d+\.\d+(\.\d+)?')
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s-]')
+_WHITESPACE_RE = re.compile(r'\s+')
+_BADGE_PATTERNS = [
+    re.compile(r'!\[.*\]\(https://img\.shields\.io/'),
+    re.compile(r'!\[.*\]\(https://badge\.fury\.io/'),
+    re.compile(r'!\[.*\]\(.*\.svg\)'),
+    re.compile(r'\[!\[.*\]\(.*\)\]\(.*\)'),  # Linked badges
+]
+# Fenced code block: captures the optional language tag and the body
+_FENCED_CODE_RE = re.compile(r'```(\w*)[ \t]*\n(.*?)```', re.DOTALL)
+_INDENTED_CODE_LINE_RE = re.compile(r'^    \S')  # 4+ spaces, not just whitespace
+_TOC_LINK_RE = re.compile(r'\[.*?\]\(#.*?\)')
+_LIST_MARKER_RE = re.compile(r'^\s*[-*+]\s*')
+_EMPHASIS_RE = re.compile(r'[*_`]+')
+_WORD_RE = re.compile(r'\b([a-zA-Z0-9_-]+)\b')
+_PIP_INSTALL_RE = re.compile(r'pip install\s+([^\n`]+)', re.IGNORECASE)
+_PACKAGE_NAME_RE = re.compile(r'([a-zA-Z0-9_-]+)')
+_REQUIREMENT_SPLIT_RE = re.compile(r'[>=<!~\s]')
+
 
 @dataclass
 class EvaluationResults:
@@ -110,14 +133,14 @@ class AdvancedREADMEParser:
             # Setext headings (underlined with = or -)
             elif i + 1 < len(self.lines):
                 next_line = self.lines[i + 1].strip()
-                if re.match(r'^=+$', next_line):
+                if _SETEXT_H1_RE.match(next_line):
                     headings.append({
                         'level': 1,
                         'text': line,
                         'normalized': self._normalize_text(line),
                         'line_number': i
                     })
-                elif re.match(r'^-+$', next_line):
+                elif _SETEXT_H2_RE.match(next_line):
                     headings.append({
                         'level': 2,
                         'text': line,
@@ -130,9 +153,9 @@ class AdvancedREADMEParser:
     def _normalize_text(self, text: str) -> str:
         """Normalize text for comparison."""
         # Remove version numbers, special chars, etc.
-        text = re.sub(r'v?\d+\.\d+(\.\d+)?', '', text)  # Remove versions
-        text = re.sub(r'[^\w\s-]', '', text)  # Remove special chars
-        text = re.sub(r'\s+', ' ', text).strip().lower()
+        text = _VERSION_RE.sub('', text)  # Remove versions
+        text = _SPECIAL_CHARS_RE.sub('', text)  # Remove special chars
+        text = _WHITESPACE_RE.sub(' ', text).strip().lower()
         return text
     
     def _build_section_map(self) -> Dict[str, str]:
@@ -187,16 +210,9 @@ class AdvancedREADMEParser:
     
     def count_badges(self) -> int:
         """Count shield/badge images."""
-        badge_patterns = [
-            r'!\[.*\]\(https://img\.shields\.io/',
-            r'!\[.*\]\(https://badge\.fury\.io/',
-            r'!\[.*\]\(.*\.svg\)',
-            r'\[!\[.*\]\(.*\)\]\(.*\)',  # Linked badges
-        ]
-        
         count = 0
-        for pattern in badge_patterns:
-            count += len(re.findall(pattern, self.content))
+        for pattern in _BADGE_PATTERNS:
+            count += len(pattern.findall(self.content))
         
         return count
     
@@ -205,10 +221,7 @@ class AdvancedREADMEParser:
         blocks = defaultdict(list)
         
         # Fenced code blocks
-        pattern = r'``````'
-        matches = re.findall(pattern, self.content, re.DOTALL)
-        
-        for lang, code in matches:
+        for lang, code in _FENCED_CODE_RE.findall(self.content):
             lang = lang.lower() if lang else 'unknown'
             blocks[lang].append(code.strip())
         
@@ -218,7 +231,7 @@ class AdvancedREADMEParser:
         current_block = []
         
         for line in lines:
-            if re.match(r'^    \S', line):  # 4+ spaces, not just whitespace
+            if _INDENTED_CODE_LINE_RE.match(line):
                 if not in_indented_block:
                     in_indented_block = True
                     current_block = []
@@ -260,7 +273,7 @@ class AdvancedREADMEParser:
             return {'present': False, 'links': 0, 'structure': 'none'}
         
         # Count markdown links
-        links = re.findall(r'\[.*?\]\(#.*?\)', toc_content)
+        links = _TOC_LINK_RE.findall(toc_content)
         
         # Analyze structure depth
         lines = toc_content.split('\n')
@@ -294,11 +307,11 @@ class AdvancedREADMEParser:
             for line in dep_content.split('\n'):
                 line = line.strip()
                 # Remove markdown formatting
-                line = re.sub(r'^\s*[-*+]\s*', '', line)
-                line = re.sub(r'[*_`]+', '', line)
+                line = _LIST_MARKER_RE.sub('', line)
+                line = _EMPHASIS_RE.sub('', line)
                 
                 # Extract package names
-                matches = re.findall(r'\b([a-zA-Z0-9_-]+)\b', line)
+                matches = _WORD_RE.findall(line)
                 for match in matches:
                     if len(match) > 2 and not match.isdigit():
                         deps.add(match.lower())
@@ -306,12 +319,12 @@ class AdvancedREADMEParser:
         # Check installation commands
         install_content = self.get_section('installation', 'install', 'getting started')
         if install_content:
-            pip_commands = re.findall(r'pip install\s+([^\n`]+)', install_content, re.IGNORECASE)
+            pip_commands = _PIP_INSTALL_RE.findall(install_content)
             for cmd in pip_commands:
                 packages = cmd.strip().split()
                 for pkg in packages:
                     if not pkg.startswith('-'):
-                        clean_pkg = re.match(r'([a-zA-Z0-9_-]+)', pkg)
+                        clean_pkg = _PACKAGE_NAME_RE.match(pkg)
                         if clean_pkg:
                             deps.add(clean_pkg.group(1).lower())
         
@@ -338,7 +351,7 @@ class AdvancedProjectAnalyzer:
         
         for dep in data.get('dependencies', []):
             # Clean dependency specification
-            clean_dep = re.split(r'[>=<!~\s]', dep)[0].strip()
+            clean_dep = _REQUIREMENT_SPLIT_RE.split(dep)[0].strip()
             if clean_dep:
                 deps.add(clean_dep.lower())
         
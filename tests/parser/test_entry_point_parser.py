@@ -0,0 +1,31 @@
+import ast
+
+import pytest
+
+from parser.entry_point_parser import _extract_module_docstring
+
+
+class TestExtractModuleDocstring:
+    """Test cases for reading a script's module docstring."""
+
+    @pytest.mark.parametrize("source", [
+        '"""Usage: %s <file>""" % __file__\nx = """other"""\n',
+        '"""Doc.""".strip()\nHELP = """\nhelp text\n"""\n',
+        '"""a""" "b"\n',
+        'r"""x\\"""y"""\n',
+    ])
+    def test_string_expression_is_not_a_docstring_prefix(self, tmp_path, source):
+        """A leading string that is only part of a larger statement matches the AST."""
+        script = tmp_path / "cli.py"
+        script.write_text(source)
+
+        expected = ast.get_docstring(ast.parse(source)) or ""
+        assert _extract_module_docstring(source, script) == expected
+
+    def test_plain_docstring(self, tmp_path):
+        """A docstring followed by code is read without the trailing source."""
+        source = '# comment\n"""\n    Run the tool.\n"""  # trailing\nx = """other"""\n'
+        script = tmp_path / "cli.py"
+        script.write_text(source)
+
+        assert _extract_module_docstring(source, script) == "Run the tool."